@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Album Aggregation Benchmark
+===========================
+Feeds the same album query rows through the original merge_album_rows
+(which rebuilt a set of the artist's album names for every row) and
+through AlbumAggregator, for a batch of prolific artists whose releases
+arrive as several rows each: reissues under the exact title, with
+later years. Reports the time each takes per batch and checks that both
+keep the same albums.
+
+Usage:
+    python3 benchmarks/bench_albums.py                         # 200 artists x 500 releases
+    python3 benchmarks/bench_albums.py --releases 2000 --artists 800
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import fetch_wikipedia_artists as fetcher  # noqa: E402
+
+
+def make_rows(artists: int, releases: int, seed: int = 0) -> list[tuple[str, str, int]]:
+    """(qid, album, year) rows in an arbitrary order; about a third are reissue rows."""
+    rng = random.Random(seed)
+    rows = []
+    for a in range(artists):
+        qid = f"Q{1000 + a}"
+        for r in range(releases):
+            year = 1970 + r % 50
+            rows.append((qid, f"Release {r}", year))
+            if r % 3 == 0:
+                rows.append((qid, f"Release {r}", year + rng.randint(1, 20)))
+    rng.shuffle(rows)
+    return rows
+
+
+def legacy_merge(rows) -> dict[str, list[fetcher.AlbumRecord]]:
+    """The original merge_album_rows: first row per exact title wins."""
+    albums: dict[str, list[fetcher.AlbumRecord]] = {}
+    for artist, album_name, year in rows:
+        if artist not in albums:
+            albums[artist] = []
+        existing = {a.name for a in albums[artist]}
+        if album_name not in existing:
+            albums[artist].append(fetcher.AlbumRecord(album_name, year))
+    return albums
+
+
+def aggregate(rows) -> dict[str, list[fetcher.AlbumRecord]]:
+    aggregator = fetcher.AlbumAggregator()
+    aggregator.add_rows(rows)
+    return aggregator.result()
+
+
+def timed(fn, rows) -> tuple[float, dict]:
+    start = time.perf_counter()
+    result = fn(rows)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark client-side album deduplication")
+    parser.add_argument("--artists", type=int, default=200, help="Artists per batch (ALBUM_BATCH)")
+    parser.add_argument("--releases", type=int, default=500, help="Distinct releases per artist")
+    args = parser.parse_args()
+
+    rows = make_rows(args.artists, args.releases)
+    print(f"{args.artists} artists x {args.releases} releases = {len(rows):,} rows")
+    legacy_s, legacy = timed(legacy_merge, rows)
+    new_s, new = timed(aggregate, rows)
+    print(f"\n{'merge':<16}{'seconds':>10}{'rows/s':>14}")
+    for name, seconds in (("legacy", legacy_s), ("aggregator", new_s)):
+        print(f"{name:<16}{seconds:>10.3f}{len(rows) / seconds:>14,.0f}")
+    print(f"\nSpeedup: {legacy_s / new_s:.1f}x")
+
+    same_titles = all({a.name for a in legacy[q]} == {a.name for a in new[q]} for q in legacy)
+    earliest = all(a.year == 1970 + int(a.name.split()[1]) % 50 for albums in new.values() for a in albums)
+    print(f"Same albums kept: {same_titles and legacy.keys() == new.keys()}")
+    print(f"Aggregator kept the earliest year: {earliest}")
+    if not (same_titles and earliest):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+db.json I/O Benchmark
+=====================
+Compares the whole-document path (load_db + extend + save_db) with the
+streaming path (scan_db + append_artists) on a synthetic db.json.
+Each measurement runs in a fresh subprocess so peak RSS is not shared.
+
+Usage:
+    python3 benchmarks/bench_db_io.py                     # 100k existing artists
+    python3 benchmarks/bench_db_io.py --artists 500000    # Bigger catalog
+    python3 benchmarks/bench_db_io.py --new 5000          # Append more artists per run
+"""
+
+import argparse
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import fetch_wikipedia_artists as fetcher  # noqa: E402
+
+
+def make_artist(artist_id: int, first_album_id: int, albums: int) -> dict:
+    return {
+        "artist_id": artist_id,
+        "artist_name": f"Synthetic Artist {artist_id}",
+        "aka": None,
+        "genre": "hip hop / trap",
+        "count": 0,
+        "state": "GA",
+        "region": "South",
+        "label": "Synthetic Records",
+        "image_url": None,
+        "mixtape": None,
+        "album": None,
+        "year": None,
+        "certifications": None,
+        "albums": [
+            {
+                "album_id": first_album_id + k,
+                "artist_id": artist_id,
+                "album_name": f"Album {k}",
+                "year": 2000 + k,
+                "certifications": None,
+            }
+            for k in range(albums)
+        ],
+    }
+
+
+def write_fixture(path: str, artists: int, albums: int):
+    """Write a db.json laid out exactly as save_db would, one artist at a time."""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{\n    "artists": [')
+        for i in range(artists):
+            f.write(",\n" if i else "\n")
+            f.write(fetcher._format_artist(make_artist(i + 1, i * albums + 1, albums)))
+        f.write("\n    ]\n}" if artists else "]\n}")
+
+
+def run_case(mode: str, path: str, new: int):
+    """Child process body: run one I/O path against ``path``."""
+    fetcher.DB_JSON_PATH = path
+    start = time.perf_counter()
+    if mode == "legacy":
+        db = fetcher.load_db()
+        artists = db["artists"]
+        base_id = max(a["artist_id"] for a in artists)
+        base_album = max(alb["album_id"] for a in artists for alb in a["albums"])
+        artists.extend(make_artist(base_id + i + 1, base_album + i * 3 + 1, 3) for i in range(new))
+        fetcher.save_db(db)
+    else:
+        summary = fetcher.scan_db(path)
+        entries = [make_artist(summary.max_artist_id + i + 1, summary.max_album_id + i * 3 + 1, 3)
+                   for i in range(new)]
+        fetcher.append_artists(entries, summary, path)
+    elapsed = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps({"seconds": elapsed, "peak_rss_mb": peak_mb}))
+
+
+def measure(mode: str, fixture: str, workdir: str, new: int) -> dict:
+    path = os.path.join(workdir, f"{mode}.json")
+    shutil.copyfile(fixture, path)
+    proc = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", mode, path, "--new", str(new)],
+        check=True, capture_output=True, text=True,
+    )
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    with open(path, "rb") as f:
+        result["output"] = f.read()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark db.json load/save paths")
+    parser.add_argument("--artists", type=int, default=100_000, help="Existing artists in the fixture")
+    parser.add_argument("--albums", type=int, default=3, help="Albums per existing artist")
+    parser.add_argument("--new", type=int, default=1000, help="Artists appended per run")
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_case(args.child[0], args.child[1], args.new)
+        return
+
+    workdir = tempfile.mkdtemp(prefix="bench_db_io_")
+    try:
+        fixture = os.path.join(workdir, "fixture.json")
+        write_fixture(fixture, args.artists, args.albums)
+        size_mb = os.path.getsize(fixture) / 1024 / 1024
+        print(f"Fixture: {args.artists} artists, {size_mb:.1f} MB; appending {args.new}")
+
+        legacy = measure("legacy", fixture, workdir, args.new)
+        streaming = measure("streaming", fixture, workdir, args.new)
+
+        print(f"\n{'path':<12}{'wall (s)':>12}{'peak RSS (MB)':>16}")
+        for name, r in (("legacy", legacy), ("streaming", streaming)):
+            print(f"{name:<12}{r['seconds']:>12.2f}{r['peak_rss_mb']:>16.1f}")
+        identical = legacy["output"] == streaming["output"]
+        print(f"\nOutputs identical: {identical}")
+        if not identical:
+            sys.exit(1)
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Artist Record Memory Benchmark
+==============================
+Builds the new-artist working set the way main() holds it just before the
+write, once with the original representation (a metadata dict per artist,
+album dicts, then a 14-key entry dict per artist) and once with
+ArtistMeta / AlbumRecord / ArtistRecord and interned categorical strings.
+Strings are copied per row, as JSON decoding would hand them over.
+Each representation is built in its own subprocess; reports the Python
+heap it holds (tracemalloc) and peak RSS, and checks that both serialize
+to identical db.json entries.
+
+Usage:
+    python3 benchmarks/bench_records.py                     # 1M artists, 2 albums each
+    python3 benchmarks/bench_records.py --artists 200000 --albums 0
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import fetch_wikipedia_artists as fetcher  # noqa: E402
+
+GENRES = ["hip hop music", "trap music", "pop music", "contemporary R&B", "rock music", "jazz",
+          "country music", "gospel music", "drill music", "neo soul"]
+PLACES = [("Atlanta, Georgia", "United States of America"), ("Compton", "United States of America"),
+          ("Kansas City, Missouri", "United States of America"), ("Toronto", "Canada"),
+          ("London", "United Kingdom"), ("Lagos", "Nigeria"), ("Houston, Texas", "United States of America")]
+LABELS = 5_000
+
+
+def fresh(s: str) -> str:
+    """A new string object equal to ``s`` (what a JSON decoder returns per row)."""
+    return s[:1] + s[1:]
+
+
+def raw_rows(artists: int):
+    """Yield (qid, name, genres, place, label) as Phase 2 decodes them."""
+    for i in range(artists):
+        genres = [fresh(GENRES[(i + k) % len(GENRES)]) for k in range(1 + i % 3)]
+        birthplace, country = PLACES[i % len(PLACES)]
+        yield (f"Q{1000 + i}", f"Synthetic Artist {i}", genres, (fresh(birthplace), fresh(country)),
+               f"Label {i % LABELS}" if i % 4 else "")
+
+
+def album_rows(qid: str, albums: int):
+    return [(qid, f"{qid} LP {k + 1}", 1990 + k) for k in range(albums)]
+
+
+def legacy_make_metadata(genres, location, label) -> dict:
+    """The original dict-returning make_metadata."""
+    genre_list = [g.strip() for g in genres if g and g.strip()][:3]
+    genre_str = " / ".join(genre_list) if genre_list else None
+    if genre_str and len(genre_str) > 100:
+        genre_str = genre_str[:97] + "..."
+    state, region = location
+    return {"genre": genre_str, "state": state, "region": region, "label": label if label else None}
+
+
+def build_legacy(artists: int, albums: int) -> tuple[list[dict], tuple]:
+    """Return the entries plus everything else main() still holds when it writes."""
+    metadata, album_data, new_artists = {}, {}, []
+    for qid, name, genres, place, label in raw_rows(artists):
+        new_artists.append((qid, name))
+        metadata[qid] = legacy_make_metadata(genres, fetcher.resolve_location(*place), label)
+        if albums:
+            album_data[qid] = [{"album_name": n, "year": y} for _, n, y in album_rows(qid, albums)]
+    new_entries = []
+    next_artist_id, next_album_id = 1, 1
+    for qid, name in new_artists:
+        meta = metadata.get(qid, {})
+        album_entries = []
+        for alb in album_data.get(qid, []):
+            album_entries.append({"album_id": next_album_id, "artist_id": next_artist_id,
+                                  "album_name": alb["album_name"], "year": alb.get("year"),
+                                  "certifications": None})
+            next_album_id += 1
+        new_entries.append({
+            "artist_id": next_artist_id, "artist_name": name, "wikidata_id": qid, "aka": None,
+            "genre": meta.get("genre"), "count": 0, "state": meta.get("state"),
+            "region": meta.get("region"), "label": meta.get("label"), "image_url": None,
+            "mixtape": None, "album": None, "year": None, "certifications": None,
+            "albums": album_entries if album_entries else [],
+        })
+        next_artist_id += 1
+    return new_entries, (metadata, album_data, new_artists)
+
+
+def build_records(artists: int, albums: int) -> tuple[list, tuple]:
+    metadata, new_artists = {}, []
+    aggregator = fetcher.AlbumAggregator()
+    for qid, name, genres, place, label in raw_rows(artists):
+        new_artists.append((qid, name))
+        metadata[qid] = fetcher.make_metadata(genres, fetcher.resolve_location(*place), label)
+        if albums:
+            aggregator.add_rows(album_rows(qid, albums))
+    album_data = aggregator.result()
+    del aggregator
+    new_entries = []
+    next_artist_id, next_album_id = 1, 1
+    for qid, name in new_artists:
+        artist_albums = album_data.get(qid)
+        new_entries.append(fetcher.ArtistRecord(next_artist_id, name, qid, metadata.get(qid),
+                                                next_album_id, artist_albums))
+        next_artist_id += 1
+        next_album_id += len(artist_albums or ())
+    del metadata, album_data
+    return new_entries, (new_artists,)
+
+
+def run_case(mode: str, artists: int, albums: int):
+    """Child process body: build one representation and report its footprint."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    entries, _held = (build_legacy if mode == "legacy" else build_records)(artists, albums)
+    elapsed = time.perf_counter() - start
+    held, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    sample = [entries[i] for i in range(0, len(entries), max(1, len(entries) // 1000))]
+    if mode == "records":
+        sample = [r.to_dict() for r in sample]
+    print(json.dumps({"seconds": elapsed, "held_mb": held / 1e6,
+                      "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+                      "sample": sample}))
+
+
+def measure(mode: str, artists: int, albums: int) -> dict:
+    proc = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", mode,
+         "--artists", str(artists), "--albums", str(albums)],
+        check=True, capture_output=True, text=True,
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark in-memory artist record representations")
+    parser.add_argument("--artists", type=int, default=1_000_000)
+    parser.add_argument("--albums", type=int, default=2, help="Albums per artist")
+    parser.add_argument("--child", choices=("legacy", "records"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_case(args.child, args.artists, args.albums)
+        return
+
+    print(f"{args.artists:,} artists, {args.albums} albums each")
+    results = {mode: measure(mode, args.artists, args.albums) for mode in ("legacy", "records")}
+    print(f"\n{'representation':<16}{'build (s)':>10}{'heap held (MB)':>16}{'peak RSS (MB)':>15}")
+    for name, r in results.items():
+        print(f"{name:<16}{r['seconds']:>10.2f}{r['held_mb']:>16.1f}{r['peak_rss_mb']:>15.1f}")
+    legacy, records = results["legacy"], results["records"]
+    print(f"\nHeap reduction: {legacy['held_mb'] / records['held_mb']:.2f}x")
+    same = legacy["sample"] == records["sample"]
+    print(f"Serialized entries match: {same}")
+    if not same:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
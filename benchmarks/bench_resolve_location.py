@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Location Resolver Benchmark
+===========================
+Checks resolve_location against a regression corpus of birthplace strings,
+then times it against the original linear US_STATES scan on a synthetic
+workload of repeated birthplaces (as a metadata page would contain).
+Exits non-zero if any corpus entry resolves wrongly.
+
+Usage:
+    python3 benchmarks/bench_resolve_location.py                 # 200k lookups
+    python3 benchmarks/bench_resolve_location.py --lookups 1000000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import fetch_wikipedia_artists as fetcher  # noqa: E402
+
+
+def legacy_resolve_location(birthplace: str, country: str) -> tuple[str | None, str | None]:
+    """The original per-call linear scan, kept here for comparison."""
+    bp_lower = birthplace.lower().strip()
+    for state_name, abbr in fetcher.US_STATES.items():
+        if state_name in bp_lower:
+            return abbr, fetcher.REGION_MAP.get(abbr)
+    if country and ("united states" in country.lower() or "u.s." in country.lower()):
+        return None, None
+    if country:
+        return country, None
+    return None, None
+
+
+def make_workload(lookups: int, distinct: int) -> list[tuple[str, str]]:
+    rng = random.Random(9)
+    states = list(fetcher.US_STATES)
+    places = [(f"Town {i}, {rng.choice(states).title()}", "United States of America")
+              for i in range(distinct)]
+    places += [(f"Town {i}", rng.choice(["Canada", "France", "Japan"])) for i in range(distinct // 4)]
+    return [rng.choice(places) for _ in range(lookups)]
+
+
+def timed(label: str, fn, workload) -> float:
+    start = time.perf_counter()
+    fn(workload)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<28} {elapsed:7.3f}s  ({len(workload) / elapsed:,.0f} lookups/s)")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark resolve_location")
+    parser.add_argument("--lookups", type=int, default=200_000)
+    parser.add_argument("--distinct", type=int, default=20_000,
+                        help="Distinct birthplace strings in the workload")
+    args = parser.parse_args()
+
+    workload = make_workload(args.lookups, args.distinct)
+    print(f"\nResolving {len(workload):,} birthplaces ({args.distinct:,} distinct US towns):")
+    legacy = timed("legacy scan", lambda w: [legacy_resolve_location(*p) for p in w], workload)
+    fetcher.resolve_location.cache_clear()
+    cold = timed("matcher, uncached", lambda w: [fetcher.resolve_location.__wrapped__(*p) for p in w],
+                 workload)
+    fetcher.resolve_location.cache_clear()
+    batch = timed("resolve_locations (cached)", fetcher.resolve_locations, workload)
+    print(f"\nSpeedup: {legacy / cold:.1f}x uncached, {legacy / batch:.1f}x with memoization")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+SPARQL Transport Benchmark
+==========================
+Compares the original request path (a fresh urlopen per query, no gzip,
+resp.read() + decode + json.loads) with sparql_rows() (pooled keep-alive
+connections, gzip, rows decoded one at a time) against a local HTTP/1.1
+server returning synthetic metadata rows. A delay on each new connection
+stands in for the TCP + TLS handshake to the real endpoint.
+The server and each path run in separate subprocesses, so peak RSS is not
+shared (a forked child inherits its parent's high-water mark).
+
+Usage:
+    python3 benchmarks/bench_sparql_transport.py                    # 20 queries x 50k rows
+    python3 benchmarks/bench_sparql_transport.py --rows 200000      # Bigger responses
+    python3 benchmarks/bench_sparql_transport.py --connect-ms 0     # No handshake cost
+"""
+
+import argparse
+import gzip
+import json
+import os
+import resource
+import subprocess
+import sys
+import threading
+import time
+import urllib.parse
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import fetch_wikipedia_artists as fetcher  # noqa: E402
+
+
+def make_body(rows: int) -> bytes:
+    bindings = [{
+        "artist": {"type": "uri", "value": f"http://www.wikidata.org/entity/Q{i + 1}"},
+        "genres": {"type": "literal", "value": "hip hop music / trap music / pop rap"},
+        "country": {"type": "literal", "value": "United States of America"},
+        "birthplace": {"type": "literal", "value": f"Town {i % 5000}, Georgia"},
+        "recordLabel": {"type": "literal", "value": "Synthetic Records"},
+    } for i in range(rows)]
+    return json.dumps({"head": {"vars": ["artist", "genres", "country", "birthplace", "recordLabel"]},
+                       "results": {"bindings": bindings}}).encode("utf-8")
+
+
+def serve(rows: int, connect_ms: float):
+    """Server process body: print the port, serve until stdin closes.
+
+    GET /stats returns (and resets) the connection and byte counters.
+    """
+    plain = make_body(rows)
+    compressed = gzip.compress(plain, 5)
+    stats = {"connections": 0, "bytes": 0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def setup(self):
+            super().setup()
+            with lock:
+                stats["connections"] += 1
+            time.sleep(connect_ms / 1000)
+
+        def do_GET(self):
+            with lock:
+                body = json.dumps(stats).encode("utf-8")
+                stats["connections"] = stats["bytes"] = 0
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            use_gzip = "gzip" in self.headers.get("Accept-Encoding", "")
+            body = compressed if use_gzip else plain
+            self.send_response(200)
+            self.send_header("Content-Type", "application/sparql-results+json")
+            if use_gzip:
+                self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            with lock:
+                stats["bytes"] += len(body)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(server.server_port, flush=True)
+    sys.stdin.read()
+    server.shutdown()
+
+
+def legacy_query(url: str, query: str) -> list[dict]:
+    """The original _execute_query request path, minus retries."""
+    body = urllib.parse.urlencode({"query": query}).encode("utf-8")
+    req = urllib.request.Request(url, data=body, headers={
+        "User-Agent": fetcher.USER_AGENT,
+        "Accept": "application/json",
+        "Content-Type": "application/x-www-form-urlencoded",
+    })
+    with urllib.request.urlopen(req, timeout=180) as resp:
+        raw = resp.read().decode("utf-8")
+        data = json.loads(raw)
+        return data.get("results", {}).get("bindings", [])
+
+
+def run_case(mode: str, url: str, queries: int):
+    """Child process body: run ``queries`` queries and consume every row."""
+    fetcher.WIKIDATA_SPARQL_URL = url
+    fetcher.CACHE.configure(fetcher.CACHE_DIR, 0, 0, enabled=False)
+    fetcher.RATE_LIMITER.configure(1000, 1)
+    rows = 0
+    start = time.perf_counter()
+    for i in range(queries):
+        query = f"SELECT ?artist WHERE {{ }} # {i}"
+        results = legacy_query(url, query) if mode == "legacy" else fetcher.sparql_rows(query, use_post=True)
+        for r in results:
+            rows += bool(r["artist"]["value"])
+    elapsed = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps({"seconds": elapsed, "peak_rss_mb": peak_mb, "rows": rows}))
+
+
+def server_stats(url: str) -> dict:
+    with urllib.request.urlopen(url, timeout=30) as resp:
+        return json.loads(resp.read())
+
+
+def measure(mode: str, url: str, queries: int) -> dict:
+    server_stats(url)
+    proc = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", mode, url, "--queries", str(queries)],
+        check=True, capture_output=True, text=True,
+    )
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    stats = server_stats(url)
+    stats["connections"] -= 1   # the /stats request itself
+    result.update(stats)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SPARQL request paths")
+    parser.add_argument("--rows", type=int, default=50_000, help="Rows per response")
+    parser.add_argument("--queries", type=int, default=20, help="Queries per path")
+    parser.add_argument("--connect-ms", type=float, default=100,
+                        help="Delay on each new connection, standing in for the TLS handshake")
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "URL"), help=argparse.SUPPRESS)
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_case(args.child[0], args.child[1], args.queries)
+        return
+    if args.serve:
+        serve(args.rows, args.connect_ms)
+        return
+
+    server = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "--serve",
+         "--rows", str(args.rows), "--connect-ms", str(args.connect_ms)],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True,
+    )
+    try:
+        url = f"http://127.0.0.1:{int(server.stdout.readline())}/sparql"
+        print(f"{args.queries} queries x {args.rows:,} rows, {args.connect_ms:.0f} ms per new connection")
+        results = {mode: measure(mode, url, args.queries) for mode in ("legacy", "streaming")}
+    finally:
+        server.stdin.close()
+        server.wait()
+
+    print(f"\n{'path':<12}{'wall (s)':>10}{'peak RSS (MB)':>15}{'connections':>13}{'MB on wire':>12}")
+    for name, r in results.items():
+        print(f"{name:<12}{r['seconds']:>10.2f}{r['peak_rss_mb']:>15.1f}"
+              f"{r['connections']:>13}{r['bytes'] / 1024 / 1024:>12.1f}")
+    same = results["legacy"]["rows"] == results["streaming"]["rows"] == args.rows * args.queries
+    print(f"\nRow counts match: {same}")
+    if not same:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Fetcher Benchmark Suite
+=======================
+Runs each stage of fetch_wikipedia_artists.py against the local fake SPARQL
+endpoint (benchmarks/fake_sparql_server.py) at several catalog sizes and
+reports wall time, throughput and peak RSS. Every stage runs in a fresh
+subprocess; the fake endpoint runs in its own process too, so neither
+skews the other's memory numbers.
+
+Stages:
+    discovery         discover_artists() with LIMIT/OFFSET pages
+    discovery-keyset  discover_artists() with QID-range pages
+    metadata          fetch_metadata() for every artist
+    albums            fetch_albums() for every artist
+    resolve_location  resolve_locations() over one birthplace per artist
+    save_db           save_db() of a catalog of that size
+    append_artists    scan_db() + append_artists() of that many new artists
+
+Usage:
+    python3 benchmarks/bench_suite.py                              # 1k, 10k, 100k
+    python3 benchmarks/bench_suite.py --sizes 1000 --stages metadata albums
+    python3 benchmarks/bench_suite.py --latency-ms 50 --p429 0.02 --concurrency 8
+    python3 benchmarks/bench_suite.py --json-out bench.json        # Keep results for comparison
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import fetch_wikipedia_artists as fetcher  # noqa: E402
+
+STAGES = ["discovery", "discovery-keyset", "metadata", "albums",
+          "resolve_location", "save_db", "append_artists"]
+FAKE_SERVER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fake_sparql_server.py")
+
+
+def qids(size: int) -> list[str]:
+    return [f"Q{1000 + i}" for i in range(size)]
+
+
+def make_entry(i: int) -> dict:
+    return {
+        "artist_id": i + 1, "artist_name": f"Synthetic Artist {i}", "wikidata_id": f"Q{1000 + i}",
+        "aka": None, "genre": "hip hop music", "count": 0, "state": "GA", "region": "South",
+        "label": "Synthetic Records", "image_url": None, "mixtape": None, "album": None,
+        "year": None, "certifications": None,
+        "albums": [{"album_id": 3 * i + k + 1, "artist_id": i + 1, "album_name": f"LP {k}",
+                    "year": 2000 + k, "certifications": None} for k in range(3)],
+    }
+
+
+def run_stage(stage: str, size: int, url: str, workdir: str, concurrency: int) -> int:
+    """Run one stage and return how many items it processed."""
+    if stage.startswith("discovery"):
+        mode = "keyset" if stage == "discovery-keyset" else "offset"
+        return len(fetcher.discover_artists(None, mode))
+    if stage == "metadata":
+        return len(fetcher.fetch_metadata(qids(size), concurrency))
+    if stage == "albums":
+        return sum(len(a) for a in fetcher.fetch_albums(qids(size), concurrency).values())
+    if stage == "resolve_location":
+        states = list(fetcher.US_STATES)
+        places = [(f"Town {i}, {states[i % len(states)].title()}", "United States of America")
+                  for i in range(size)]
+        return sum(1 for state, _ in fetcher.resolve_locations(places) if state)
+    if stage == "save_db":
+        fetcher.save_db({"artists": [make_entry(i) for i in range(size)]})
+        return size
+    if stage == "append_artists":
+        fetcher.save_db({"artists": []})
+        summary = fetcher.scan_db()
+        fetcher.append_artists([make_entry(i) for i in range(size)], summary)
+        return size
+    raise ValueError(f"unknown stage {stage}")
+
+
+def child(stage: str, size: int, url: str, workdir: str, concurrency: int):
+    """Subprocess body: configure the fetcher for the fake endpoint and time one stage."""
+    fetcher.WIKIDATA_SPARQL_URL = url
+    fetcher.DB_JSON_PATH = os.path.join(workdir, "db.json")
+    fetcher.DEAD_LETTER.path = os.path.join(workdir, "dead_letter.jsonl")
+    fetcher.CACHE.configure(fetcher.CACHE_DIR, 0, 0, enabled=False)
+    fetcher.RATE_LIMITER.configure(1000, max(1, concurrency))
+    fetcher.BACKOFF_BASE = 0.2
+    start = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        items = run_stage(stage, size, url, workdir, concurrency)
+    elapsed = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps({"seconds": elapsed, "items": items, "peak_rss_mb": peak_mb,
+                      "dead_lettered": fetcher.DEAD_LETTER.count}))
+
+
+def start_fake_server(size: int, args) -> tuple[subprocess.Popen, str]:
+    proc = subprocess.Popen(
+        [sys.executable, FAKE_SERVER, "--port", "0", "--artists", str(size),
+         "--latency-ms", str(args.latency_ms), "--p429", str(args.p429),
+         "--p5xx", str(args.p5xx), "--ptruncate", str(args.ptruncate)],
+        stdout=subprocess.PIPE, text=True,
+    )
+    return proc, proc.stdout.readline().strip()
+
+
+def measure(stage: str, size: int, url: str, concurrency: int) -> dict:
+    workdir = tempfile.mkdtemp(prefix="bench_suite_")
+    try:
+        proc = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", stage, str(size), url, workdir,
+             "--concurrency", str(concurrency)],
+            check=True, capture_output=True, text=True,
+        )
+        return json.loads(proc.stdout.strip().splitlines()[-1])
+    finally:
+        shutil.rmtree(workdir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark fetcher stages against a fake SPARQL endpoint")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--latency-ms", type=float, default=0, help="Mean latency the fake endpoint adds")
+    parser.add_argument("--p429", type=float, default=0)
+    parser.add_argument("--p5xx", type=float, default=0)
+    parser.add_argument("--ptruncate", type=float, default=0)
+    parser.add_argument("--json-out", metavar="PATH", help="Also write the results as JSON")
+    parser.add_argument("--child", nargs=4, metavar=("STAGE", "SIZE", "URL", "WORKDIR"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        stage, size, url, workdir = args.child
+        child(stage, int(size), url, workdir, args.concurrency)
+        return
+
+    print(f"{'size':>8}  {'stage':<18}{'wall (s)':>10}{'items/s':>12}{'peak RSS (MB)':>15}")
+    results = []
+    for size in args.sizes:
+        server, url = start_fake_server(size, args)
+        try:
+            for stage in args.stages:
+                r = measure(stage, size, url, args.concurrency)
+                r.update(size=size, stage=stage)
+                results.append(r)
+                rate = r["items"] / r["seconds"] if r["seconds"] else float("inf")
+                note = f"  ({r['dead_lettered']} dead-lettered)" if r["dead_lettered"] else ""
+                print(f"{size:>8}  {stage:<18}{r['seconds']:>10.2f}{rate:>12,.0f}{r['peak_rss_mb']:>15.1f}{note}",
+                      flush=True)
+        finally:
+            server.terminate()
+            server.wait()
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nWrote {args.json_out}")
+
+
+if __name__ == "__main__":
+    main()
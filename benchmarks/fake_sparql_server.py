@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Fake SPARQL Endpoint
+====================
+A local stand-in for query.wikidata.org that answers the queries
+fetch_wikipedia_artists.py sends, so the fetcher can be exercised and
+benchmarked without touching production.
+
+Responses are synthesized from a deterministic universe of ``--artists``
+artists (QIDs Q1000, Q1001, ...), spread over the seven solo occupations
+and bands. With ``--replay DIR`` queries are first looked up in a fetcher
+cache directory, so a cache filled by a real run (``--cache-dir DIR``)
+doubles as a set of recorded fixtures.
+
+Faults can be injected per request: extra latency, 429s with Retry-After,
+5xx errors and JSON bodies that break off half way (what WDQS sends when a
+query times out mid-response). ``--fail-qids`` makes every VALUES query
+that mentions one of the given QIDs fail with ``--fail-status``, to
+exercise the fetcher's batch splitting and dead-letter file.
+
+Usage:
+    python3 benchmarks/fake_sparql_server.py --artists 10000 --port 8890
+    python3 benchmarks/fake_sparql_server.py --replay .sparql_cache --strict
+    python3 benchmarks/fake_sparql_server.py --latency-ms 200 --p429 0.05 --p5xx 0.02 --ptruncate 0.01
+
+    python3 fetch_wikipedia_artists.py --endpoint http://127.0.0.1:8890/sparql --cache-dir /tmp/c
+"""
+
+import argparse
+import gzip
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import fetch_wikipedia_artists as fetcher  # noqa: E402
+
+ENTITY = "http://www.wikidata.org/entity/"
+FIRST_QID = 1000
+SOURCES = [occ_id for occ_id, _ in fetcher.SOLO_OCCUPATION_IDS] + ["Q215380"]
+
+BIRTHPLACES = [
+    ("Atlanta, Georgia", "United States of America"),
+    ("Compton", "United States of America"),
+    ("Kansas City, Missouri", "United States of America"),
+    ("Brooklyn, New York", "United States of America"),
+    ("Washington, D.C.", "United States of America"),
+    ("Toronto", "Canada"),
+    ("London", "United Kingdom"),
+    ("Lagos", "Nigeria"),
+]
+GENRES = ["hip hop music", "trap music", "pop music", "contemporary R&B", "rock music", "jazz"]
+LABELS = ["Def Jam Recordings", "Atlantic Records", "Top Dawg Entertainment", "XL Recordings"]
+RELEASE_CLASSES = ["Q208569", "Q169930 Q482994", "Q217199"]   # studio album, EP, mixtape
+
+
+class Universe:
+    """The synthetic artists and the rows each kind of query returns for them."""
+
+    def __init__(self, artists: int, albums: int, homonyms: frozenset[str] = frozenset()):
+        self.artists = artists
+        self.albums = albums
+        self.homonyms = homonyms
+
+    def name(self, n: int) -> str:
+        return f"Synthetic Artist {n}"
+
+    def _source_qnums(self, source: str) -> range:
+        k = SOURCES.index(source) if source in SOURCES else 0
+        return range(FIRST_QID + k, FIRST_QID + self.artists, len(SOURCES))
+
+    def image(self, n: int) -> str | None:
+        """Special:FilePath URL of the artist's P18 image; every third artist has none."""
+        if n % 3 == 0:
+            return None
+        return f"http://commons.wikimedia.org/wiki/Special:FilePath/{self.name(n).replace(' ', '%20')}.jpg"
+
+    def sitelinks(self, n: int) -> int:
+        return (n * 37) % 251
+
+    def _artist_row(self, n: int) -> dict:
+        return {"artist": {"type": "uri", "value": f"{ENTITY}Q{n}"},
+                "artistLabel": {"type": "literal", "xml:lang": "en", "value": self.name(n)},
+                "sitelinks": {"type": "literal", "datatype": "http://www.w3.org/2001/XMLSchema#integer",
+                              "value": str(self.sitelinks(n))}}
+
+    def _valid(self, qids: list[str]) -> list[int]:
+        return [n for n in (int(q[1:]) for q in qids) if FIRST_QID <= n < FIRST_QID + self.artists]
+
+    def answer(self, query: str) -> list[dict]:
+        values = re.search(r"VALUES \?artist \{([^}]*)\}", query)
+        qids = re.findall(r"wd:(Q\d+)", values.group(1)) if values else []
+        if "schema:dateModified" in query:
+            return [{"artist": {"type": "uri", "value": f"{ENTITY}Q{n}"}}
+                    for n in self._valid(qids) if n % 10 == 0]
+        if "wdt:P18" in query and "GROUP_CONCAT" not in query:
+            return [{"artist": {"type": "uri", "value": f"{ENTITY}Q{n}"},
+                     "image": {"type": "literal", "value": self.image(n)}}
+                    for n in self._valid(qids) if self.image(n)]
+        if "?albumLabel" in query:
+            rows = []
+            for n in self._valid(qids):
+                for k in range(self.albums):
+                    title, year = f"{self.name(n)} LP {k + 1}", 1990 + (n + k) % 35
+                    releases = [(title, year)]
+                    if n % 5 == 0 and k == 0:
+                        releases.append((title.upper() + " ", year + 3))  # a reissue under a variant label
+                    for label, released in releases:
+                        row = {"artist": {"type": "uri", "value": f"{ENTITY}Q{n}"},
+                               "albumLabel": {"type": "literal", "xml:lang": "en", "value": label},
+                               "albumYear": {"type": "literal", "value": str(released)}}
+                        if "AS ?types" in query:
+                            row["types"] = {"type": "literal", "value": RELEASE_CLASSES[k % len(RELEASE_CLASSES)]}
+                        rows.append(row)
+            return rows
+        if "GROUP_CONCAT" in query:
+            rows = []
+            for n in self._valid(qids):
+                birthplace, country = BIRTHPLACES[n % len(BIRTHPLACES)]
+                genres = " / ".join(GENRES[(n + i) % len(GENRES)] for i in range(1 + n % 3))
+                rows.append({"artist": {"type": "uri", "value": f"{ENTITY}Q{n}"},
+                             "genres": {"type": "literal", "value": genres},
+                             "country": {"type": "literal", "value": country},
+                             "birthplace": {"type": "literal", "value": birthplace},
+                             "recordLabel": {"type": "literal", "value": LABELS[n % len(LABELS)]}})
+                if self.image(n):
+                    rows[-1]["image"] = {"type": "literal", "value": self.image(n)}
+            return rows
+        if "VALUES ?artistLabel" in query:
+            rows = []
+            for label in re.findall(r'"((?:[^"\\]|\\.)*)"@en', query):
+                m = re.fullmatch(r"Synthetic Artist (\d+)", label)
+                if m and self._valid([f"Q{m.group(1)}"]):
+                    rows.append(self._artist_row(int(m.group(1))))
+                    if f"Q{m.group(1)}" in self.homonyms:
+                        # A second, unrelated entity with the same English label
+                        rows.append({**rows[-1], "artist": {"type": "uri", "value": f"{ENTITY}Q9{m.group(1)}"}})
+            return rows
+        source = next((s for s in SOURCES if f"wd:{s} " in query or f"wd:{s}\n" in query), SOURCES[0])
+        qnums = self._source_qnums(source)
+        shard = re.search(r"FLOOR\(\?shardQnum / (\d+)\) \* \d+ = (\d+)", query)
+        if shard:
+            count, index = int(shard.group(1)), int(shard.group(2))
+            qnums = [n for n in qnums if n % count == index]
+        limit = int(re.search(r"LIMIT (\d+)", query).group(1))
+        bounds = re.search(r"\?qnum >= (\d+) && \?qnum < (\d+)", query)
+        if bounds:
+            lo, hi = int(bounds.group(1)), int(bounds.group(2))
+            page = [n for n in qnums if lo <= n < hi][:limit]
+        else:
+            offset = re.search(r"OFFSET (\d+)", query)
+            start = int(offset.group(1)) if offset else 0
+            page = qnums[start:start + limit]
+        return [self._artist_row(n) for n in page]
+
+
+def replay(directory: str, query: str, endpoint: str = fetcher.WIKIDATA_SPARQL_URL) -> list[dict] | None:
+    """Look ``query`` up in a fetcher cache directory (any age), as recorded from ``endpoint``.
+
+    The fetcher caches VALUES ?artist queries one artist at a time, so those
+    are answered from each artist's own entry.
+    """
+    values = re.search(r"VALUES \?artist \{([^}]*)\}", query)
+    if values:
+        rows = []
+        for qid in re.findall(r"wd:(Q\d+)", values.group(1)):
+            single = query[:values.start(1)] + f" {fetcher.qid_values([qid])} " + query[values.end(1):]
+            found = _replay_entry(directory, single, endpoint)
+            if found is None:
+                return None
+            rows.extend(found)
+        return rows
+    return _replay_entry(directory, query, endpoint)
+
+
+def _replay_entry(directory: str, query: str, endpoint: str) -> list[dict] | None:
+    key = fetcher.SparqlCache.key(query, endpoint)
+    path = os.path.join(directory, key[:2], f"{key}.json.gz")
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return json.load(f)["bindings"]
+    except (OSError, EOFError, ValueError, KeyError):
+        return None
+
+
+def make_server(port: int = 0, artists: int = 10_000, albums: int = 3, replay_dir: str | None = None,
+                strict: bool = False, replay_endpoint: str = fetcher.WIKIDATA_SPARQL_URL,
+                latency_ms: float = 0, p429: float = 0, p5xx: float = 0, ptruncate: float = 0,
+                seed: int = 0, fail_qids: frozenset[str] = frozenset(),
+                fail_status: int = 500, homonyms: frozenset[str] = frozenset()) -> ThreadingHTTPServer:
+    """Build (but do not start) a fake endpoint; ``server.stats`` counts what it served."""
+    universe = Universe(artists, albums, homonyms)
+    rng = random.Random(seed)
+    lock = threading.Lock()
+    stats = {"requests": 0, "connections": 0, "rows": 0, "bytes": 0,
+             "429": 0, "5xx": 0, "truncated": 0, "replayed": 0, "failed": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def setup(self):
+            super().setup()
+            with lock:
+                stats["connections"] += 1
+
+        def do_GET(self):
+            params = urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query)
+            if "query" not in params:
+                self._send(200, json.dumps(stats).encode("utf-8"))
+                return
+            self._answer(params["query"][0])
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0))).decode("utf-8")
+            self._answer(urllib.parse.parse_qs(body).get("query", [""])[0])
+
+        def _send(self, status: int, body: bytes, headers: dict | None = None):
+            self.send_response(status)
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _answer(self, query: str):
+            with lock:
+                stats["requests"] += 1
+                roll = rng.random()
+                jitter = rng.random()
+            if latency_ms:
+                time.sleep(latency_ms * (0.5 + jitter) / 1000)
+            values = re.search(r"VALUES \?artist \{([^}]*)\}", query)
+            if values and fail_qids.intersection(re.findall(r"wd:(Q\d+)", values.group(1))):
+                with lock:
+                    stats["failed"] += 1
+                self._send(fail_status, b"Injected failure", {"Retry-After": "0"})
+                return
+            if roll < p429:
+                with lock:
+                    stats["429"] += 1
+                self._send(429, b"Too Many Requests", {"Retry-After": "1"})
+                return
+            if roll < p429 + p5xx:
+                with lock:
+                    stats["5xx"] += 1
+                self._send(503, b"Service Unavailable")
+                return
+
+            rows = replay(replay_dir, query, replay_endpoint) if replay_dir else None
+            if rows is not None:
+                with lock:
+                    stats["replayed"] += 1
+            elif strict:
+                self._send(404, b"No recorded response for this query")
+                return
+            else:
+                rows = universe.answer(query)
+            body = json.dumps({"head": {"vars": []}, "results": {"bindings": rows}}).encode("utf-8")
+            if roll < p429 + p5xx + ptruncate:
+                body = body[:len(body) // 2]
+                with lock:
+                    stats["truncated"] += 1
+            headers = {"Content-Type": "application/sparql-results+json"}
+            if "gzip" in self.headers.get("Accept-Encoding", ""):
+                body = gzip.compress(body, 5)
+                headers["Content-Encoding"] = "gzip"
+            self._send(200, body, headers)
+            with lock:
+                stats["rows"] += len(rows)
+                stats["bytes"] += len(body)
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    server.daemon_threads = True
+    server.stats = stats
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the Wikidata SPARQL endpoint")
+    parser.add_argument("--port", type=int, default=8890, help="0 picks a free port")
+    parser.add_argument("--artists", type=int, default=10_000, help="Size of the synthetic universe")
+    parser.add_argument("--albums", type=int, default=3, help="Albums per synthetic artist")
+    parser.add_argument("--replay", metavar="DIR", help="Serve recorded responses from a fetcher cache directory")
+    parser.add_argument("--strict", action="store_true", help="With --replay, 404 instead of synthesizing on a miss")
+    parser.add_argument("--replay-endpoint", default=fetcher.WIKIDATA_SPARQL_URL,
+                        help="Endpoint the replayed cache was recorded from (part of its keys)")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Mean added latency per request")
+    parser.add_argument("--p429", type=float, default=0, help="Probability of a 429 with Retry-After")
+    parser.add_argument("--p5xx", type=float, default=0, help="Probability of a 503")
+    parser.add_argument("--ptruncate", type=float, default=0, help="Probability of a body cut off half way")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for fault injection")
+    parser.add_argument("--fail-qids", default="", metavar="Q1,Q2",
+                        help="Fail every VALUES query that mentions one of these QIDs")
+    parser.add_argument("--fail-status", type=int, default=500, help="HTTP status for --fail-qids")
+    parser.add_argument("--homonyms", default="", metavar="Q1,Q2",
+                        help="Give these artists' names to a second entity in label lookups")
+    args = parser.parse_args()
+
+    server = make_server(args.port, args.artists, args.albums, args.replay, args.strict,
+                         args.replay_endpoint, args.latency_ms, args.p429, args.p5xx, args.ptruncate, args.seed,
+                         frozenset(q for q in args.fail_qids.split(",") if q), args.fail_status,
+                         frozenset(q for q in args.homonyms.split(",") if q))
+    print(f"http://127.0.0.1:{server.server_port}/sparql", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Shared fixtures for the fetch_wikipedia_artists.py tests.
+
+Everything runs offline: queries go to benchmarks/fake_sparql_server.py on
+a local port, and every path the fetcher writes to lives under tmp_path.
+"""
+
+import json
+import os
+import sys
+import threading
+
+import pytest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, os.path.join(REPO_DIR, "benchmarks"))
+
+import fake_sparql_server  # noqa: E402
+import fetch_wikipedia_artists as fetcher  # noqa: E402
+
+SEED_ARTISTS = [
+    {"artist_id": 1, "artist_name": "Synthetic Artist 1000", "wikidata_id": "Q1000", "aka": None,
+     "genre": None, "count": 0, "state": None, "region": None, "label": None, "image_url": None,
+     "mixtape": None, "album": None, "year": None, "certifications": None,
+     "albums": [{"album_id": 1, "artist_id": 1, "album_name": "Seed LP", "year": 2001,
+                 "certifications": None}]},
+    {"artist_id": 2, "artist_name": "Unlinked Artist", "aka": None, "genre": None, "count": 0,
+     "state": None, "region": None, "label": None, "image_url": None, "mixtape": None,
+     "album": None, "year": None, "certifications": None, "albums": []},
+]
+
+
+@pytest.fixture
+def fake_endpoint():
+    """Start a fake SPARQL endpoint; call it with make_server() keyword arguments, get its URL."""
+    servers = []
+
+    def start(**kwargs):
+        server = fake_sparql_server.make_server(port=0, **kwargs)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_port}/sparql", server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """A db.json with two seed artists, and the fetcher's state pointed at tmp_path."""
+    db_path = write_db(tmp_path, SEED_ARTISTS)
+    monkeypatch.setattr(fetcher, "DB_JSON_PATH", str(db_path))
+    monkeypatch.setattr(fetcher, "WIKIDATA_SPARQL_URL", fetcher.WIKIDATA_SPARQL_URL)
+    monkeypatch.setattr(fetcher, "BACKOFF_BASE", 0.01)
+    # Small batches, so a universe of a few hundred artists still spans several
+    monkeypatch.setattr(fetcher, "DISCOVERY_BATCH", 50)
+    monkeypatch.setattr(fetcher, "METADATA_BATCH", 20)
+    monkeypatch.setattr(fetcher, "ALBUM_BATCH", 10)
+    monkeypatch.setattr(fetcher.DEAD_LETTER, "path", str(tmp_path / "dead_letter.jsonl"))
+    monkeypatch.setattr(fetcher.DEAD_LETTER, "count", 0)
+    monkeypatch.setattr(fetcher, "SESSION", fetcher.SparqlSession())
+    for var in ("http_proxy", "https_proxy", "no_proxy", "HTTP_PROXY", "HTTPS_PROXY", "NO_PROXY"):
+        monkeypatch.delenv(var, raising=False)
+    fetcher.CACHE.configure(str(tmp_path / "cache"), 3600, 1 << 30, enabled=False)
+    fetcher.RATE_LIMITER.configure(1000, 8)
+    fetcher.METRICS.reset()
+    yield tmp_path
+    fetcher.CACHE.configure(fetcher.CACHE_DIR, 0, 0, enabled=False)
+
+
+@pytest.fixture
+def run_cli(workdir, monkeypatch, capsys):
+    """Run the command line in-process with every state file under the workdir; return its output."""
+
+    def run(*argv, endpoint=None):
+        args = ["fetch_wikipedia_artists.py", "--rate", "1000",
+                "--cache-dir", str(workdir / "cache"),
+                "--checkpoint", str(workdir / "checkpoint.jsonl"),
+                "--dead-letter", str(workdir / "dead_letter.jsonl"),
+                "--sync-state", str(workdir / "sync_state.json"),
+                "--shard-dir", str(workdir / "shards")]
+        if endpoint:
+            args += ["--endpoint", endpoint]
+        monkeypatch.setattr(sys, "argv", args + list(argv))
+        capsys.readouterr()
+        fetcher.main()
+        return capsys.readouterr().out
+
+    return run
+
+
+def write_db(workdir, artists: list[dict]):
+    db_path = workdir / "db.json"
+    db_path.write_text(json.dumps({"artists": artists}, indent=2), encoding="utf-8")
+    return db_path
+
+
+def load_artists(workdir) -> list[dict]:
+    with open(workdir / "db.json", encoding="utf-8") as f:
+        return json.load(f)["artists"]
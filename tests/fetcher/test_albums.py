@@ -0,0 +1,69 @@
+"""Album deduplication (AlbumAggregator)."""
+
+import itertools
+
+from conftest import fetcher, load_artists
+
+ROWS = [
+    ("Q1", "good kid, m.A.A.d city", 2012, None),
+    ("Q1", "Good Kid, M.A.A.D City", 2013, None),
+    ("Q1", "To Pimp a Butterfly", 2015, None),
+    ("Q1", "untitled unmastered.", None, None),
+    ("Q1", "Untitled Unmastered.", 2016, None),
+    ("Q2", "To Pimp a Butterfly", 2015, None),
+]
+
+
+def test_variant_titles_collapse_to_the_earliest_release():
+    aggregator = fetcher.AlbumAggregator()
+    found, touched = aggregator.add_rows(ROWS)
+    assert found == 4
+    assert touched == ["Q1", "Q2"]
+    assert aggregator.albums("Q1") == [
+        fetcher.AlbumRecord("good kid, m.A.A.d city", 2012),
+        fetcher.AlbumRecord("To Pimp a Butterfly", 2015),
+        fetcher.AlbumRecord("Untitled Unmastered.", 2016),
+    ]
+    assert list(aggregator.result()) == ["Q1", "Q2"]
+
+
+def test_result_does_not_depend_on_row_order():
+    expected = None
+    for order in itertools.permutations(ROWS[:5]):
+        aggregator = fetcher.AlbumAggregator()
+        aggregator.add_rows(order)
+        expected = expected or aggregator.albums("Q1")
+        assert aggregator.albums("Q1") == expected
+
+
+def test_release_type_tie_break_does_not_depend_on_row_order():
+    rows = [("Q1", "Sampler", 2010, "compilation"), ("Q1", "Sampler", 2010, "ep"),
+            ("Q1", "Sampler", 2010, None), ("Q1", "Sampler", 2010, "album")]
+    for order in itertools.permutations(rows):
+        aggregator = fetcher.AlbumAggregator()
+        aggregator.add_rows(order)
+        assert aggregator.albums("Q1") == [fetcher.AlbumRecord("Sampler", 2010, "album")]
+    aggregator = fetcher.AlbumAggregator()
+    aggregator.add_rows([rows[2], rows[0], rows[1]])
+    assert aggregator.albums("Q1")[0].release_type == "ep"
+
+
+def test_fake_endpoint_reissues_are_merged(fake_endpoint, run_cli, workdir):
+    url, _server = fake_endpoint(artists=20, albums=3)
+    run_cli("--with-albums", "--no-cache", endpoint=url)
+    by_qid = {a.get("wikidata_id"): a for a in load_artists(workdir)}
+    # Q1005 also has an upper-cased reissue of its first LP, three years later
+    assert [(a["album_name"], a["year"]) for a in by_qid["Q1005"]["albums"]] == [
+        ("Synthetic Artist 1005 LP 1", 2015), ("Synthetic Artist 1005 LP 2", 2016),
+        ("Synthetic Artist 1005 LP 3", 2017)]
+
+
+def test_album_types_is_a_parameter_not_global_state(fake_endpoint, workdir, monkeypatch):
+    url, _server = fake_endpoint(artists=20, albums=3)
+    monkeypatch.setattr(fetcher, "WIKIDATA_SPARQL_URL", url)
+    typed = fetcher.fetch_albums(["Q1001"], album_types=True)["Q1001"]
+    assert [a.release_type for a in typed] == ["album", "ep", "mixtape"]
+    # The same process, without the flag, sends the plain query again
+    plain = fetcher.fetch_albums(["Q1001"])["Q1001"]
+    assert [a.name for a in plain] == [a.name for a in typed]
+    assert {a.release_type for a in plain} == {None}
@@ -0,0 +1,96 @@
+"""Batch sizing, bisection and the response cache, against the fake endpoint."""
+
+import re
+import socket
+
+import pytest
+
+from conftest import fetcher
+
+
+def unreachable_url() -> str:
+    with socket.socket() as unused:
+        unused.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{unused.getsockname()[1]}/sparql"
+
+
+def requests_with_status(status: str) -> float:
+    return sum(value for (name, labels), value in fetcher.METRICS.counters.items()
+               if name == "sparql_requests_total" and ("status", status) in labels)
+
+
+def backoff_seconds() -> float:
+    return sum(value for (name, _labels), value in fetcher.METRICS.counters.items()
+               if name == "backoff_seconds_total")
+
+
+def test_cached_run_replays_with_other_concurrency(fake_endpoint, run_cli, workdir):
+    url, server = fake_endpoint(artists=200)
+    out = run_cli("--with-albums", "--dry-run", "--concurrency", "4", endpoint=url)
+    requests = server.stats["requests"]
+    # The cache is on, and batch sizes still adapt to the fast endpoint
+    assert max(int(n) for n in re.findall(r"Batch \d+ \((\d+) artists", out)) > fetcher.METADATA_BATCH
+
+    # Responses are cached per artist, so differently cut batches are served too
+    out = run_cli("--with-albums", "--dry-run", "--cache-only", "--target-latency", "0", "--fresh",
+                  endpoint=url)
+    assert server.stats["requests"] == requests
+    assert "not in cache" not in out
+    assert fetcher.CACHE.misses == 0
+    assert fetcher.DEAD_LETTER.count == 0
+    assert "New artists to add:      199" in out
+
+
+def test_cache_only_miss_is_skipped_not_dead_lettered(fake_endpoint, run_cli, workdir):
+    url, server = fake_endpoint(artists=200)
+    run_cli("--dry-run", endpoint=url)
+
+    out = run_cli("--with-albums", "--dry-run", "--cache-only", "--fresh", endpoint=url)
+    assert "not in cache — skipped" in out
+    assert fetcher.DEAD_LETTER.count == 0
+    assert not (workdir / "dead_letter.jsonl").exists()
+    assert "Total new albums:        0" in out
+
+
+def test_server_error_bisects_to_the_failing_qid(fake_endpoint, run_cli, workdir):
+    url, server = fake_endpoint(artists=200, fail_qids=frozenset({"Q1010"}))
+    out = run_cli("--no-cache", "--dry-run", endpoint=url)
+    assert fetcher.DEAD_LETTER.load() == {"metadata": ["Q1010"]}
+    assert "Artists with metadata:   198" in out
+
+
+def test_rate_limited_batch_is_dead_lettered_without_splitting(fake_endpoint, run_cli, workdir):
+    url, server = fake_endpoint(artists=200, fail_qids=frozenset({"Q1010"}), fail_status=429)
+    out = run_cli("--no-cache", "--dry-run", endpoint=url)
+    assert "dead-lettered without splitting" in out
+    assert server.stats["failed"] == fetcher.BATCH_RETRIES
+    # The fake endpoint sends Retry-After: 0, which is honoured rather than backed off
+    assert backoff_seconds() == 0
+    dead = fetcher.DEAD_LETTER.load()["metadata"]
+    assert "Q1010" in dead and len(dead) >= fetcher.METADATA_BATCH
+
+
+def test_client_error_is_not_retried_or_split(fake_endpoint, run_cli, workdir):
+    url, server = fake_endpoint(artists=200, fail_qids=frozenset({"Q1010"}), fail_status=400)
+    run_cli("--no-cache", "--dry-run", endpoint=url)
+    assert server.stats["failed"] == 1
+    assert len(fetcher.DEAD_LETTER.load()["metadata"]) >= fetcher.METADATA_BATCH
+
+
+def test_unreachable_endpoint_is_not_split_or_dead_lettered(workdir, monkeypatch):
+    monkeypatch.setattr(fetcher, "WIKIDATA_SPARQL_URL", unreachable_url())
+    qids = [f"Q{n}" for n in range(1000, 1064)]
+    with pytest.raises(fetcher.SparqlTransportError):
+        fetcher.fetch_metadata(qids, target_latency=60)
+    # One batch, tried BATCH_RETRIES times, never split
+    assert requests_with_status("network") == fetcher.BATCH_RETRIES
+    assert fetcher.DEAD_LETTER.count == 0
+    assert not (workdir / "dead_letter.jsonl").exists()
+
+
+def test_unreachable_endpoint_exits_with_an_error(fake_endpoint, run_cli, workdir):
+    url, _server = fake_endpoint(artists=200)
+    run_cli("--dry-run", endpoint=url)   # journals discovery and metadata
+    with pytest.raises(SystemExit, match="unreachable.*--resume"):
+        run_cli("--dry-run", "--with-albums", "--resume", endpoint=unreachable_url())
+    assert fetcher.DEAD_LETTER.count == 0
@@ -0,0 +1,28 @@
+"""The on-disk SPARQL response cache."""
+
+from conftest import SEED_ARTISTS, fetcher, load_artists, write_db
+
+
+def test_cache_is_keyed_by_endpoint(fake_endpoint, run_cli, workdir):
+    first_url, _first = fake_endpoint(artists=100)
+    run_cli("--dry-run", endpoint=first_url)
+
+    second_url, second = fake_endpoint(artists=50)
+    out = run_cli("--dry-run", "--fresh", endpoint=second_url)
+    assert fetcher.CACHE.hits == 0
+    assert second.stats["requests"] > 0
+    assert "New artists to add:      49" in out
+
+
+def test_recorded_cache_replays_from_fake_endpoint(fake_endpoint, run_cli, workdir):
+    recorded_url, _recorded = fake_endpoint(artists=100)
+    run_cli("--with-albums", endpoint=recorded_url)
+    recorded = load_artists(workdir)
+
+    replay_url, replaying = fake_endpoint(artists=0, replay_dir=str(workdir / "cache"), strict=True,
+                                          replay_endpoint=recorded_url)
+    write_db(workdir, SEED_ARTISTS)
+    # Answered from the recorded per-artist entries; the local cache misses because the endpoint differs
+    run_cli("--with-albums", endpoint=replay_url)
+    assert replaying.stats["replayed"] == replaying.stats["requests"] > 0
+    assert load_artists(workdir) == recorded
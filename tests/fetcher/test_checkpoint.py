@@ -0,0 +1,54 @@
+"""Interrupted runs picked up again with --resume."""
+
+import pytest
+
+from conftest import SEED_ARTISTS, fetcher, load_artists, write_db
+
+
+def test_resume_after_failed_album_batch(fake_endpoint, run_cli, workdir, monkeypatch):
+    url, server = fake_endpoint(artists=300)
+    run_cli("--with-albums", "--no-cache", endpoint=url)
+    expected = load_artists(workdir)
+    full_run = server.stats["requests"]
+
+    write_db(workdir, SEED_ARTISTS)
+    fetch_batch = fetcher._fetch_albums_batch
+    calls = []
+
+    def failing_batch(batch, **kwargs):
+        calls.append(batch)
+        if len(calls) == 4:
+            raise RuntimeError("interrupted")
+        return fetch_batch(batch, **kwargs)
+
+    monkeypatch.setattr(fetcher, "_fetch_albums_batch", failing_batch)
+    with pytest.raises(RuntimeError, match="interrupted"):
+        run_cli("--with-albums", "--no-cache", endpoint=url)
+    assert load_artists(workdir) == SEED_ARTISTS
+    assert (workdir / "checkpoint.jsonl").exists()
+
+    monkeypatch.setattr(fetcher, "_fetch_albums_batch", fetch_batch)
+    before = server.stats["requests"]
+    out = run_cli("--with-albums", "--no-cache", "--resume", endpoint=url)
+    assert "Resumed checkpoint" in out
+    assert load_artists(workdir) == expected
+    # Discovery, metadata and the finished album batches came from the journal
+    assert server.stats["requests"] - before < full_run
+    assert not (workdir / "checkpoint.jsonl").exists()
+
+
+def test_existing_journal_is_never_truncated(fake_endpoint, run_cli, workdir):
+    url, _server = fake_endpoint(artists=100)
+    run_cli("--dry-run", endpoint=url)
+    journal = (workdir / "checkpoint.jsonl").read_bytes()
+    assert journal
+
+    # Neither --resume nor --fresh: refuse to start, and leave the journal alone
+    with pytest.raises(SystemExit):
+        run_cli("--dry-run", endpoint=url)
+    assert (workdir / "checkpoint.jsonl").read_bytes() == journal
+
+    out = run_cli("--dry-run", "--fresh", endpoint=url)
+    assert "Moved the previous checkpoint journal" in out
+    assert (workdir / "checkpoint.jsonl.old").read_bytes() == journal
+    assert (workdir / "checkpoint.jsonl").read_bytes() == journal
@@ -0,0 +1,11 @@
+"""Command-line validation."""
+
+import pytest
+
+
+@pytest.mark.parametrize("rate", ["0", "-1", "nan", "inf", "fast"])
+def test_rate_must_be_positive(run_cli, capsys, rate):
+    with pytest.raises(SystemExit) as excinfo:
+        run_cli("--dry-run", "--rate", rate)
+    assert excinfo.value.code == 2
+    assert "argument --rate" in capsys.readouterr().err
@@ -0,0 +1,36 @@
+"""--from-dump against tests/fetcher/fixtures/wikidata-mini.json.gz.
+
+The fixture holds a rapper (Q900001) with genres, a Memphis birthplace, a
+label, an image and an album plus its reissue; a band (Q900002) with a live
+album; and entities that must be skipped: a politician, a singer without an
+English article, a painting and a single.
+"""
+
+import os
+
+import pytest
+
+from conftest import load_artists
+
+DUMP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "wikidata-mini.json.gz")
+
+
+@pytest.mark.parametrize("processes", ["1", "2"])
+def test_from_dump_adds_artists_with_metadata(run_cli, workdir, processes):
+    run_cli("--from-dump", DUMP, "--dump-processes", processes, "--with-albums", "--no-cache")
+    added = {a["wikidata_id"]: a for a in load_artists(workdir)[2:]}
+    assert sorted(added) == ["Q900001", "Q900002"]
+
+    rapper = added["Q900001"]
+    assert rapper["artist_name"] == "Fixture Rapper"
+    assert rapper["genre"] == "hip hop music / Southern hip hop"
+    assert rapper["state"] == "TN"
+    assert rapper["label"] == "Fixture Records"
+    assert rapper["image_url"].endswith("/300px-Fixture_Rapper_2019.jpg")
+    assert [(a["album_name"], a["year"]) for a in rapper["albums"]] == [("Fixture Debut", 2012)]
+
+    band = added["Q900002"]
+    assert band["artist_name"] == "The Fixture Band"
+    assert band["genre"] == "rock music"
+    assert band["state"] is None
+    assert [(a["album_name"], a["year"]) for a in band["albums"]] == [("Live at the Fixture", 2001)]
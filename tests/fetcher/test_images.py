@@ -0,0 +1,70 @@
+"""Commons thumbnail URLs and --images-only."""
+
+import pytest
+
+from conftest import fetcher, load_artists, write_db
+
+THUMBS = fetcher.COMMONS_UPLOAD_URL + "/thumb"
+
+
+@pytest.mark.parametrize("image, url", [
+    # Stored under the first one and two hex digits of md5("Example.jpg") = a9...
+    ("Example.jpg", f"{THUMBS}/a/a9/Example.jpg/300px-Example.jpg"),
+    # The first letter is capitalized, spaces become underscores, before hashing
+    ("example.jpg", f"{THUMBS}/a/a9/Example.jpg/300px-Example.jpg"),
+    ("Kendrick Lamar 2016.jpg", f"{THUMBS}/a/a7/Kendrick_Lamar_2016.jpg/300px-Kendrick_Lamar_2016.jpg"),
+    ("http://commons.wikimedia.org/wiki/Special:FilePath/Kendrick%20Lamar%202016.jpg",
+     f"{THUMBS}/a/a7/Kendrick_Lamar_2016.jpg/300px-Kendrick_Lamar_2016.jpg"),
+    # The hash is over UTF-8; the URL is percent-encoded
+    ("Björk Orkestral.jpg", f"{THUMBS}/e/e7/Bj%C3%B6rk_Orkestral.jpg/300px-Bj%C3%B6rk_Orkestral.jpg"),
+    ("Tom & Jerry?.jpg", f"{THUMBS}/f/fe/Tom_%26_Jerry%3F.jpg/300px-Tom_%26_Jerry%3F.jpg"),
+    # Vector images are rendered to PNG thumbnails
+    ("Logo.svg", f"{THUMBS}/6/6f/Logo.svg/300px-Logo.svg.png"),
+    ("  ", None),
+])
+def test_commons_thumb_url(image, url):
+    assert fetcher.commons_thumb_url(image) == url
+
+
+def test_thumb_width():
+    assert fetcher.commons_thumb_url("Example.jpg", 120).endswith("/Example.jpg/120px-Example.jpg")
+
+
+def entry(artist_id: int, qid: str | None, image_url: str | None) -> dict:
+    artist = {"artist_id": artist_id, "artist_name": f"Artist {artist_id}"}
+    if qid:
+        artist["wikidata_id"] = qid
+    artist.update({"genre": None, "image_url": image_url, "albums": []})
+    return artist
+
+
+def test_images_only_fills_only_missing_image_urls(fake_endpoint, run_cli, workdir):
+    # The fake endpoint has a P18 image for every QID not divisible by 3
+    url, _server = fake_endpoint(artists=20)
+    write_db(workdir, [
+        entry(1, "Q1001", None),
+        entry(2, "Q1004", "https://example.org/picked-by-hand.jpg"),
+        entry(3, "Q1002", None),     # no P18 on Wikidata
+        entry(4, "Q1007", ""),
+        entry(5, None, None),
+    ])
+    before = (workdir / "db.json").read_text(encoding="utf-8")
+
+    out = run_cli("--images-only", "--dry-run", endpoint=url)
+    assert "Fetching images for 3 artists" in out
+    assert (workdir / "db.json").read_text(encoding="utf-8") == before
+
+    out = run_cli("--images-only", endpoint=url)
+    assert "Stored image_url on 2 artists" in out
+    images = [a["image_url"] for a in load_artists(workdir)]
+    assert images == [
+        fetcher.commons_thumb_url("Synthetic Artist 1001.jpg"),
+        "https://example.org/picked-by-hand.jpg",
+        None,
+        fetcher.commons_thumb_url("Synthetic Artist 1007.jpg"),
+        None,
+    ]
+    assert images[0].endswith("/300px-Synthetic_Artist_1001.jpg")
+
+    out = run_cli("--images-only", endpoint=url)
+    assert "Stored image_url on 0 artists" in out
@@ -0,0 +1,41 @@
+"""The streaming db.json / cache-entry reader."""
+
+import io
+import json
+
+from conftest import fetcher
+
+
+class CountingText(io.StringIO):
+    def __init__(self, text: str):
+        super().__init__(text)
+        self.reads = 0
+
+    def read(self, size=-1):
+        self.reads += 1
+        return super().read(size)
+
+
+def test_artists_stream_matches_json_load():
+    doc = {"meta": {"nested": [1, 2.5, None, "x" * 100_000]},
+           "artists": [{"artist_id": i, "artist_name": f"Artist {i}", "albums": [{"album_id": i}] * (i % 4)}
+                       for i in range(2000)],
+           "trailing": 12345678901234567890}
+    text = json.dumps(doc, indent=4)
+    stream = fetcher._JsonStream(CountingText(text))
+    seen = {}
+    for key in stream.iter_object_keys():
+        if key == "artists":
+            seen[key] = [artist for _, artist in stream.iter_array_spans()]
+        else:
+            seen[key] = stream.value()
+    assert seen == doc
+
+
+def test_large_value_is_read_in_growing_chunks():
+    huge = {"blob": "y" * (200 * fetcher._JsonStream.CHUNK)}
+    source = CountingText(json.dumps(huge))
+    stream = fetcher._JsonStream(source)
+    assert stream.value() == huge
+    # Doubling reads: about log2(200) of them, not one per 64K chunk
+    assert source.reads <= 12
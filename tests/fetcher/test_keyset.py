@@ -0,0 +1,74 @@
+"""--discovery keyset: QID-range partitions instead of OFFSET pages."""
+
+import pytest
+
+from conftest import fetcher
+
+
+@pytest.fixture
+def keyset(workdir, fake_endpoint, monkeypatch):
+    """Point discovery at a 300-artist fake endpoint, with ranges sized for Q1000..Q1299."""
+    url, server = fake_endpoint(artists=300)
+    monkeypatch.setattr(fetcher, "WIKIDATA_SPARQL_URL", url)
+    monkeypatch.setattr(fetcher, "KEYSET_INITIAL_SPAN", 100)
+    monkeypatch.setattr(fetcher, "KEYSET_MAX_QID", 2000)
+    return server
+
+
+def discover(workdir, mode, resume=False):
+    checkpoint = fetcher.Checkpoint(str(workdir / "checkpoint.jsonl"), resume=resume)
+    try:
+        return fetcher.discover_artists(checkpoint, mode)
+    finally:
+        checkpoint.close()
+
+
+def test_keyset_finds_the_same_artists_as_offset(keyset, workdir):
+    offset = discover(workdir, "offset")
+    (workdir / "checkpoint.jsonl").unlink()
+    assert discover(workdir, "keyset") == offset
+    assert len(offset) == 300
+
+
+def test_full_pages_are_split(keyset, workdir, monkeypatch):
+    expected = discover(workdir, "keyset")
+    (workdir / "checkpoint.jsonl").unlink()
+    before = keyset.stats["requests"]
+    # Each occupation has ~37 artists per 100-QID range, so 10-row pages are always full
+    monkeypatch.setattr(fetcher, "DISCOVERY_BATCH", 10)
+    assert discover(workdir, "keyset") == expected
+    assert keyset.stats["requests"] - before > before
+
+
+def test_resume_continues_from_the_journaled_range(keyset, workdir, monkeypatch):
+    expected = discover(workdir, "keyset")
+    full_run = keyset.stats["requests"]
+    (workdir / "checkpoint.jsonl").unlink()
+
+    query = fetcher.sparql_query
+    calls = []
+
+    def interrupted(*args, **kwargs):
+        calls.append(args)
+        if len(calls) == 12:
+            raise RuntimeError("interrupted")
+        return query(*args, **kwargs)
+
+    monkeypatch.setattr(fetcher, "sparql_query", interrupted)
+    with pytest.raises(RuntimeError, match="interrupted"):
+        discover(workdir, "keyset")
+
+    monkeypatch.setattr(fetcher, "sparql_query", query)
+    before = keyset.stats["requests"]
+    assert discover(workdir, "keyset", resume=True) == expected
+    assert keyset.stats["requests"] - before == full_run - 11
+
+
+def test_persistent_failure_stops_discovery(workdir, fake_endpoint, monkeypatch):
+    url, server = fake_endpoint(artists=300, p5xx=1.0)
+    monkeypatch.setattr(fetcher, "WIKIDATA_SPARQL_URL", url)
+    monkeypatch.setattr(fetcher, "KEYSET_INITIAL_SPAN", 100)
+    monkeypatch.setattr(fetcher, "KEYSET_MAX_QID", 2000)
+    with pytest.raises(fetcher.SparqlError, match="5 keyset queries in a row failed at Q1$"):
+        discover(workdir, "keyset")
+    assert server.stats["requests"] == fetcher.KEYSET_MAX_FAILURES * fetcher.MAX_RETRIES
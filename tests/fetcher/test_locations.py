@@ -0,0 +1,54 @@
+"""Birthplace -> state resolution (resolve_location)."""
+
+import pytest
+
+from conftest import fetcher
+
+USA = "United States of America"
+
+# (birthplace, country, expected state)
+CORPUS = [
+    ("Atlanta, Georgia", USA, "GA"),
+    ("West Virginia", USA, "WV"),
+    ("Bluefield, West Virginia", USA, "WV"),
+    ("Virginia Beach, Virginia", USA, "VA"),
+    ("Washington, D.C.", USA, "DC"),
+    ("Washington DC", USA, "DC"),
+    ("Anacostia, D.C.", USA, "DC"),
+    ("D.C.", USA, "DC"),
+    ("District of Columbia", USA, "DC"),
+    ("Seattle, Washington", USA, "WA"),
+    ("Kansas City, Missouri", USA, "MO"),
+    ("Kansas City, Kansas", USA, "KS"),
+    ("Little Rock, Arkansas", USA, "AR"),
+    ("Arkansas", USA, "AR"),
+    ("New York City", USA, "NY"),
+    ("Brooklyn, New York", USA, "NY"),
+    ("Newark, New Jersey", USA, "NJ"),
+    ("Albuquerque, New Mexico", USA, "NM"),
+    ("Charlotte, North Carolina", USA, "NC"),
+    ("Providence, Rhode Island", USA, "RI"),
+    ("INDIANAPOLIS, INDIANA", USA, "IN"),
+    ("Compton", USA, None),
+    ("Detroit", USA, None),
+    ("Toronto", "Canada", "Canada"),
+    ("Mainz", "Germany", "Germany"),
+    ("Indianola", "", None),
+    ("Montanaro", "Italy", "Italy"),
+    ("Texasville", "", None),
+    ("", "", None),
+    # Initials that happen to read "D C" are not the District
+    ("D. C. Comics Tower, Tokyo", "Japan", "Japan"),
+    ("AC/DC Lane, Melbourne", "Australia", "Australia"),
+    ("D C Hall, Springfield, Illinois", USA, "IL"),
+]
+
+
+@pytest.mark.parametrize("birthplace, country, expected", CORPUS)
+def test_resolve_location(birthplace, country, expected):
+    assert fetcher.resolve_location(birthplace, country)[0] == expected
+
+
+def test_region_follows_the_state():
+    assert fetcher.resolve_location("Washington, D.C.", USA) == ("DC", "East Coast")
+    assert fetcher.resolve_location("Compton", USA) == (None, None)
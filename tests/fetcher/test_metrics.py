@@ -0,0 +1,79 @@
+"""Run metrics: counters under injected faults, and the Prometheus textfile."""
+
+import json
+import re
+
+from conftest import fetcher
+
+
+def counter(name: str, **labels) -> float:
+    """Sum of ``name`` over every label set that includes ``labels``."""
+    wanted = set(labels.items())
+    return sum(value for (n, label_set), value in fetcher.METRICS.counters.items()
+               if n == name and wanted <= set(label_set))
+
+
+def test_counters_match_the_faults_the_endpoint_injected(fake_endpoint, run_cli, workdir):
+    url, server = fake_endpoint(artists=200, p5xx=0.2, ptruncate=0.2, seed=1,
+                                fail_qids=frozenset({"Q1010"}), fail_status=429)
+    run_cli("--no-cache", "--dry-run", "--metrics-out", str(workdir / "run.json"),
+            "--prometheus-textfile", str(workdir / "run.prom"), endpoint=url)
+    stats = server.stats
+    assert stats["5xx"] and stats["truncated"] and stats["failed"]
+
+    assert counter("sparql_requests_total", status="429") == stats["failed"]
+    assert counter("sparql_requests_total", status="503") == stats["5xx"]
+    assert counter("sparql_requests_total", status="truncated") == stats["truncated"]
+    assert counter("sparql_requests_total") == stats["requests"]
+    assert counter("sparql_retries_total", reason="429") == stats["failed"]
+    assert counter("sparql_retries_total", reason="503") == stats["5xx"]
+    assert counter("backoff_seconds_total") > 0
+    # The 429s all came from metadata batches holding Q1010
+    assert counter("sparql_requests_total", status="429", phase="metadata") == stats["failed"]
+
+    report = json.loads((workdir / "run.json").read_text(encoding="utf-8"))
+    assert {c["name"] for c in report["counters"]} >= {"sparql_requests_total", "sparql_retries_total"}
+    prom = (workdir / "run.prom").read_text(encoding="utf-8")
+    assert (f'artist_fetcher_sparql_requests_total{{phase="metadata",status="429"}} {stats["failed"]}'
+            in prom.splitlines())
+
+
+def test_prometheus_textfile_format(tmp_path):
+    metrics = fetcher.Metrics()
+    metrics.count("sparql_requests_total", 2, status="200", phase="discovery")
+    metrics.count("sparql_requests_total", status='odd "quoted" \\ value\nline two', phase="discovery")
+    metrics.count("custom_events_total", phase="métadonnées")
+    for seconds in (0.002, 0.3, 0.3, 400):
+        metrics.observe("sparql_request_seconds", seconds, phase="discovery")
+    path = tmp_path / "fetcher.prom"
+    metrics.write_prometheus(str(path))
+    lines = path.read_text(encoding="utf-8").splitlines()
+
+    # Every family is introduced by HELP then TYPE, once, before its samples
+    families = {}
+    for i, line in enumerate(lines):
+        if line.startswith("# TYPE "):
+            _, _, name, kind = line.split(" ")
+            assert lines[i - 1].startswith(f"# HELP {name} ")
+            assert name not in families
+            families[name] = kind
+        elif not line.startswith("#"):
+            name = re.match(r"[a-zA-Z_:][a-zA-Z0-9_:]*", line).group(0)
+            base = re.sub(r"_(bucket|sum|count)$", "", name) if name not in families else name
+            assert base in families, line
+    assert families["artist_fetcher_sparql_requests_total"] == "counter"
+    assert families["artist_fetcher_sparql_request_seconds"] == "histogram"
+    assert "# HELP artist_fetcher_custom_events_total custom events total" in lines
+
+    # Label values escape backslash, quote and newline, and keep non-ASCII as is
+    assert ('artist_fetcher_sparql_requests_total{phase="discovery",status="odd \\"quoted\\" \\\\ value\\nline two"} 1'
+            in lines)
+    assert 'artist_fetcher_custom_events_total{phase="métadonnées"} 1' in lines
+
+    # Buckets are cumulative and +Inf equals the count
+    buckets = [line for line in lines if line.startswith("artist_fetcher_sparql_request_seconds_bucket")]
+    values = [int(line.rsplit(" ", 1)[1]) for line in buckets]
+    assert values == sorted(values)
+    assert buckets[-1] == 'artist_fetcher_sparql_request_seconds_bucket{phase="discovery",le="+Inf"} 4'
+    assert 'artist_fetcher_sparql_request_seconds_bucket{phase="discovery",le="0.5"} 3' in lines
+    assert 'artist_fetcher_sparql_request_seconds_count{phase="discovery"} 4' in lines
@@ -0,0 +1,57 @@
+"""--migrate-qids: backfilling wikidata_id on entries written before it existed."""
+
+from conftest import fetcher, load_artists, write_db
+
+
+def artist(artist_id: int, name: str, qid: str | None = None) -> dict:
+    entry = {"artist_id": artist_id, "artist_name": name}
+    if qid:
+        entry["wikidata_id"] = qid
+    entry.update({"genre": None, "state": None, "albums": []})
+    return entry
+
+
+ARTISTS = [
+    artist(1, "Synthetic Artist 1000", "Q1000"),
+    artist(2, "Synthetic Artist 1003"),
+    artist(3, "Synthetic Artist 1004"),   # shares its label with another entity
+    artist(4, "Renamed Artist", "Q1007"),
+    artist(5, "Synthetic Artist 1007"),   # resolves to a QID another entry already has
+    artist(6, "Nobody On Wikidata"),
+]
+
+
+def test_names_are_backfilled_with_their_qids(fake_endpoint, run_cli, workdir):
+    url, _server = fake_endpoint(artists=20, homonyms=frozenset({"Q1004"}))
+    write_db(workdir, ARTISTS)
+    out = run_cli("--migrate-qids", endpoint=url)
+    assert "1 names match several entities" in out
+
+    by_name = {a["artist_name"]: a for a in load_artists(workdir)}
+    assert by_name["Synthetic Artist 1003"]["wikidata_id"] == "Q1003"
+    # wikidata_id goes right after artist_name; nothing else moves
+    assert list(by_name["Synthetic Artist 1003"]) == ["artist_id", "artist_name", "wikidata_id",
+                                                      "genre", "state", "albums"]
+    for name in ("Synthetic Artist 1004", "Synthetic Artist 1007", "Nobody On Wikidata"):
+        assert "wikidata_id" not in by_name[name]
+    assert [a["wikidata_id"] for a in load_artists(workdir) if "wikidata_id" in a] == ["Q1000", "Q1003", "Q1007"]
+
+
+def test_second_run_changes_nothing(fake_endpoint, run_cli, workdir):
+    url, _server = fake_endpoint(artists=20, homonyms=frozenset({"Q1004"}))
+    write_db(workdir, ARTISTS)
+    run_cli("--migrate-qids", endpoint=url)
+    migrated = (workdir / "db.json").read_bytes()
+
+    out = run_cli("--migrate-qids", endpoint=url)
+    assert "Stored wikidata_id on 0 artists" in out
+    assert (workdir / "db.json").read_bytes() == migrated
+
+
+def test_dry_run_writes_nothing(fake_endpoint, run_cli, workdir):
+    url, _server = fake_endpoint(artists=20)
+    write_db(workdir, ARTISTS)
+    before = (workdir / "db.json").read_bytes()
+    out = run_cli("--migrate-qids", "--dry-run", endpoint=url)
+    assert "Resolved 2 of 4 artists" in out
+    assert (workdir / "db.json").read_bytes() == before
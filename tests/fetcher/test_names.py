@@ -0,0 +1,80 @@
+"""Name normalization and the db.json name index."""
+
+import pytest
+
+from conftest import fetcher
+
+
+@pytest.mark.parametrize("a, b", [
+    ("Beyoncé", "BEYONCE"),
+    ("Sigur Rós", "sigur ros"),
+    ("Motörhead", "Motorhead"),
+    ("Guns N’ Roses", "guns n' roses"),
+    ("Ｋｅｎｄｒｉｃｋ  Lamar", "kendrick lamar"),
+])
+def test_latin_variants_share_a_key(a, b):
+    assert fetcher.normalize_name(a) == fetcher.normalize_name(b)
+
+
+@pytest.mark.parametrize("a, b", [
+    ("がらくた", "からくた"),    # dakuten
+    ("パフューム", "ハフューム"),  # handakuten
+    ("Йорш", "Иорш"),            # Cyrillic short i
+    ("ดี", "ด"),                 # Thai vowel sign
+])
+def test_marks_on_other_scripts_keep_names_apart(a, b):
+    assert fetcher.normalize_name(a) != fetcher.normalize_name(b)
+
+
+def test_non_latin_keys_are_composed():
+    assert fetcher.normalize_name("がらくた") == "がらくた"
+
+
+def test_missing_db_json_is_reported(workdir, monkeypatch, capsys):
+    monkeypatch.setattr(fetcher, "DB_JSON_PATH", str(workdir / "missing.json"))
+    with pytest.raises(SystemExit) as excinfo:
+        fetcher.open_db_with_index()
+    assert excinfo.value.code == 1
+    assert f"Error: {workdir / 'missing.json'} not found." in capsys.readouterr().out
+
+
+def test_name_index_is_rebuilt_when_db_changes(workdir, capsys):
+    _db, index = fetcher.open_db_with_index()
+    assert "Rebuilt name index" in capsys.readouterr().out
+    assert fetcher.normalize_name("SYNTHETIC ARTIST 1000") in index
+    _db, index = fetcher.open_db_with_index()
+    assert "Rebuilt name index" not in capsys.readouterr().out
+    (workdir / "db.json").write_text('{"artists": []}', encoding="utf-8")
+    _db, index = fetcher.open_db_with_index()
+    assert "Rebuilt name index" in capsys.readouterr().out
+    assert len(index) == 0
+
+
+def summary_fields(db) -> tuple:
+    return db.count, db.existing_qids, db.max_artist_id, db.max_album_id, db.insert_at, db.stat
+
+
+def test_unchanged_db_is_not_rescanned(workdir, monkeypatch):
+    first, _index = fetcher.open_db_with_index()
+
+    def no_scan(*args, **kwargs):
+        raise AssertionError("db.json was scanned again")
+
+    with monkeypatch.context() as m:
+        m.setattr(fetcher, "scan_db", no_scan)
+        again, _index = fetcher.open_db_with_index()
+    assert summary_fields(again) == summary_fields(first)
+
+    (workdir / "db.json").write_text('{"artists": []}', encoding="utf-8")
+    emptied, _index = fetcher.open_db_with_index()
+    assert emptied.count == 0 and emptied.existing_qids == set()
+
+
+def test_summary_after_a_run_matches_a_fresh_scan(fake_endpoint, run_cli, workdir, monkeypatch):
+    url, _server = fake_endpoint(artists=60)
+    out = run_cli("--with-albums", endpoint=url)
+    assert "Done! db.json now has 61 artists." in out
+
+    saved = fetcher.DbSummary.load(fetcher.db_summary_path(fetcher.DB_JSON_PATH), fetcher.DB_JSON_PATH)
+    assert saved is not None
+    assert summary_fields(saved) == summary_fields(fetcher.scan_db())
@@ -0,0 +1,66 @@
+"""--pipeline runs against the fake endpoint."""
+
+import functools
+import threading
+import time
+
+import pytest
+
+from conftest import SEED_ARTISTS, fetcher, load_artists, write_db
+
+
+def test_pipeline_matches_sequential_run(fake_endpoint, run_cli, workdir):
+    url, _server = fake_endpoint(artists=300)
+    run_cli("--with-albums", "--no-cache", endpoint=url)
+    sequential = load_artists(workdir)
+
+    write_db(workdir, SEED_ARTISTS)
+    run_cli("--with-albums", "--no-cache", "--pipeline", "--concurrency", "3", endpoint=url)
+    assert load_artists(workdir) == sequential
+
+
+def test_album_stage_failure_is_raised(fake_endpoint, run_cli, workdir, monkeypatch):
+    url, _server = fake_endpoint(artists=300)
+    fetch_batch = fetcher._fetch_albums_batch
+    calls = []
+
+    def failing_batch(batch, **kwargs):
+        calls.append(batch)
+        if len(calls) == 3:
+            raise RuntimeError("album stage broke")
+        return fetch_batch(batch, **kwargs)
+
+    monkeypatch.setattr(fetcher, "_fetch_albums_batch", failing_batch)
+    before = (workdir / "db.json").read_bytes()
+    with pytest.raises(RuntimeError, match="album stage broke") as excinfo:
+        run_cli("--with-albums", "--no-cache", "--pipeline", endpoint=url)
+    assert isinstance(excinfo.value.__cause__, fetcher.PipelineAborted)
+    assert (workdir / "db.json").read_bytes() == before
+
+
+def test_stage_failing_before_it_consumes_does_not_block_discovery(fake_endpoint, run_cli, workdir, monkeypatch):
+    url, _server = fake_endpoint(artists=300)
+
+    def broken_albums(pages, *args, **kwargs):
+        # Fail once discovery is blocked on this stage's full queue
+        deadline = time.monotonic() + 10
+        while not pages._queue.full() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        raise RuntimeError("album stage broke early")
+
+    monkeypatch.setattr(fetcher, "fetch_albums", broken_albums)
+    # One buffered page, so discovery would block on the album queue if it were not cancelled
+    monkeypatch.setattr(fetcher, "PageQueue", functools.partial(fetcher.PageQueue, maxsize=1))
+    outcome = {}
+
+    def run():
+        try:
+            run_cli("--with-albums", "--no-cache", "--pipeline", endpoint=url)
+        except BaseException as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(timeout=30)
+    assert not thread.is_alive(), "pipeline hung after the album stage failed"
+    assert str(outcome["error"]) == "album stage broke early"
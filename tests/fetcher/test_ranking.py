@@ -0,0 +1,49 @@
+"""--limit: most-linked new artists first, ties broken by QID."""
+
+import pytest
+
+from conftest import fake_sparql_server, fetcher, load_artists, write_db
+
+CANDIDATES = [("Q10", "Beta"), ("Q9", "Alpha"), ("Q300", "Gamma"), ("Q25", "Delta"), ("Q4", "Epsilon")]
+SITELINKS = {"Q10": 40, "Q9": 40, "Q300": 90, "Q25": 40}   # Q4 has none recorded
+
+
+def test_most_sitelinks_first_then_lowest_qid():
+    ranked = fetcher.rank_new_artists(CANDIDATES, SITELINKS)
+    # Numeric QID order (Q9 before Q10), whatever the names; unknown counts rank last
+    assert [qid for qid, _ in ranked] == ["Q300", "Q9", "Q10", "Q25", "Q4"]
+    assert fetcher.rank_new_artists(list(reversed(CANDIDATES)), SITELINKS) == ranked
+
+
+@pytest.mark.parametrize("limit", range(1, len(CANDIDATES) + 2))
+def test_limit_keeps_the_top_of_the_full_ranking(limit):
+    full = fetcher.rank_new_artists(CANDIDATES, SITELINKS)
+    assert fetcher.rank_new_artists(CANDIDATES, SITELINKS, limit) == full[:limit]
+
+
+def test_limit_applies_after_ranking_in_a_run(fake_endpoint, run_cli, workdir):
+    # 300 artists: sitelinks repeat every 251 QIDs, so some counts tie
+    url, _server = fake_endpoint(artists=300)
+    universe = fake_sparql_server.Universe(300, 3)
+    run_cli("--limit", "8", "--no-cache", endpoint=url)
+
+    candidates = range(1001, 1300)   # Q1000 is already in db.json
+    expected = sorted(candidates, key=lambda n: (-universe.sitelinks(n), n))[:8]
+    assert len({universe.sitelinks(n) for n in expected}) < len(expected)
+    added = load_artists(workdir)[2:]
+    # Chosen by rank, then written (and numbered) in name order
+    assert sorted(int(a["wikidata_id"][1:]) for a in added) == sorted(expected)
+    assert [a["artist_name"] for a in added] == sorted(universe.name(n) for n in expected)
+    assert [a["artist_id"] for a in added] == list(range(3, 11))
+
+
+def test_limit_is_applied_when_merging_shards(fake_endpoint, run_cli, workdir):
+    url, _server = fake_endpoint(artists=300)
+    run_cli("--limit", "8", "--no-cache", endpoint=url)
+    single = load_artists(workdir)
+
+    write_db(workdir, load_artists(workdir)[:2])
+    for index in range(3):
+        run_cli("--no-cache", "--shard", f"{index}/3", endpoint=url)
+    run_cli("merge", "--limit", "8")
+    assert load_artists(workdir) == single
@@ -0,0 +1,44 @@
+"""--shard i/N runs followed by merge must match one unsharded run."""
+
+import pytest
+
+from test_dump import DUMP
+
+from conftest import SEED_ARTISTS, load_artists, write_db
+
+
+def test_dump_shards_merge_to_a_single_run(run_cli, workdir):
+    run_cli("--from-dump", DUMP, "--with-albums", "--no-cache")
+    single = load_artists(workdir)
+    assert len(single) == len(SEED_ARTISTS) + 2
+
+    write_db(workdir, SEED_ARTISTS)
+    # Three shards of two artists: one of them comes out empty
+    for index in range(3):
+        run_cli("--from-dump", DUMP, "--with-albums", "--no-cache", "--shard", f"{index}/3")
+        assert (workdir / "shards" / f"shard-{index}-of-3.ndjson").exists()
+    assert load_artists(workdir) == SEED_ARTISTS
+    run_cli("merge")
+    assert load_artists(workdir) == single
+
+
+@pytest.mark.parametrize("count", [2, 5])
+def test_endpoint_shards_merge_to_a_single_run(fake_endpoint, run_cli, workdir, count):
+    url, _server = fake_endpoint(artists=120)
+    run_cli("--with-albums", "--no-cache", endpoint=url)
+    single = load_artists(workdir)
+
+    write_db(workdir, SEED_ARTISTS)
+    # Run out of order; merge only depends on the set of shard files
+    for index in reversed(range(count)):
+        run_cli("--with-albums", "--no-cache", "--shard", f"{index}/{count}", endpoint=url)
+    run_cli("merge")
+    assert load_artists(workdir) == single
+
+
+def test_merge_refuses_an_incomplete_set(fake_endpoint, run_cli, workdir):
+    url, _server = fake_endpoint(artists=40)
+    run_cli("--no-cache", "--shard", "0/2", endpoint=url)
+    with pytest.raises(SystemExit):
+        run_cli("merge")
+    assert load_artists(workdir) == SEED_ARTISTS
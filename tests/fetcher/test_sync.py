@@ -0,0 +1,81 @@
+"""--since / --incremental: refreshing existing artists edited on Wikidata."""
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from conftest import fetcher, load_artists, write_db
+
+# The fake endpoint reports every tenth QID (Q1000, Q1010, ...) as edited
+ARTISTS = [
+    {"artist_id": 1, "artist_name": "Synthetic Artist 1000", "wikidata_id": "Q1000", "genre": "pop music",
+     "state": None, "region": None, "label": None, "image_url": "https://example.org/kept.jpg",
+     "albums": [{"album_id": 1, "artist_id": 1, "album_name": "Seed LP", "year": 2001, "certifications": None},
+                {"album_id": 2, "artist_id": 1, "album_name": "Synthetic Artist 1000 LP 1", "year": 2010,
+                 "certifications": None}]},
+    {"artist_id": 2, "artist_name": "Synthetic Artist 1001", "wikidata_id": "Q1001", "genre": "jazz",
+     "state": None, "region": None, "label": None, "image_url": None, "albums": []},
+    {"artist_id": 3, "artist_name": "Synthetic Artist 1010", "wikidata_id": "Q1010", "genre": None,
+     "state": None, "region": None, "label": None, "image_url": None, "albums": []},
+    {"artist_id": 4, "artist_name": "Unlinked Artist", "genre": None, "albums": []},
+]
+
+
+def raw_entries(workdir) -> dict[str, str]:
+    """Each artist's exact text in db.json, by name."""
+    text = (workdir / "db.json").read_text(encoding="utf-8")
+    return {a["artist_name"]: text[start:end]
+            for start, end, a in fetcher.iter_db_artists(str(workdir / "db.json"), with_spans=True)}
+
+
+def last_sync(workdir) -> datetime:
+    with open(workdir / "sync_state.json", encoding="utf-8") as f:
+        return fetcher.parse_since(json.load(f)["last_sync"])
+
+
+def test_edited_artists_are_updated_in_place(fake_endpoint, run_cli, workdir):
+    url, _server = fake_endpoint(artists=20)
+    write_db(workdir, ARTISTS)
+    before = raw_entries(workdir)
+
+    out = run_cli("--since", "2026-01-01", "--with-albums", endpoint=url)
+    assert "2 artists edited since 2026-01-01T00:00:00Z" in out
+
+    by_name = {a["artist_name"]: a for a in load_artists(workdir)}
+    edited = by_name["Synthetic Artist 1000"]
+    assert (edited["genre"], edited["state"], edited["label"]) == ("rock music / jazz", "GA", "Def Jam Recordings")
+    # A stored image_url is kept; albums already listed are not duplicated
+    assert edited["image_url"] == "https://example.org/kept.jpg"
+    assert [(a["album_id"], a["album_name"]) for a in edited["albums"]] == [
+        (1, "Seed LP"), (2, "Synthetic Artist 1000 LP 1"),
+        (3, "Synthetic Artist 1000 LP 2"), (4, "Synthetic Artist 1000 LP 3")]
+    assert by_name["Synthetic Artist 1010"]["genre"] == "pop music / contemporary R&B / rock music"
+    assert [a["album_id"] for a in by_name["Synthetic Artist 1010"]["albums"]] == [5, 6, 7]
+
+    after = raw_entries(workdir)
+    for name in ("Synthetic Artist 1001", "Unlinked Artist"):
+        assert after[name] == before[name]
+
+
+def test_sync_timestamp_advances(fake_endpoint, run_cli, workdir):
+    url, _server = fake_endpoint(artists=20)
+    write_db(workdir, ARTISTS)
+    previous = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    fetcher.save_last_sync(previous, str(workdir / "sync_state.json"))
+
+    run_cli("--incremental", "--dry-run", endpoint=url)
+    assert last_sync(workdir) == previous
+
+    started = datetime.now(timezone.utc).replace(microsecond=0)
+    out = run_cli("--incremental", endpoint=url)
+    assert "edited since 2026-01-01T00:00:00Z" in out
+    # Pulled back by the overlap window, so edits still in flight are seen next time
+    overlap = timedelta(minutes=fetcher.SYNC_OVERLAP_MINUTES)
+    assert started - overlap <= last_sync(workdir) <= datetime.now(timezone.utc) - overlap
+
+
+def test_incremental_without_state_is_an_error(run_cli, workdir):
+    with pytest.raises(SystemExit) as excinfo:
+        run_cli("--incremental")
+    assert excinfo.value.code == 2